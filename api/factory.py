@@ -0,0 +1,152 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, PlatformCollector, multiprocess
+import orjson
+import os
+import psutil
+import threading
+import time
+
+# Resposta JSON serializada com orjson em vez do json da stdlib
+class ORJSONResponse(JSONResponse):
+    def render(self, content):
+        return orjson.dumps(content)
+
+# Métricas de requisições HTTP
+REQUEST_COUNT = Counter('http_requests_total', 'Total de requisições', ['method', 'endpoint'])
+
+# Com vários workers do gunicorn, PROMETHEUS_MULTIPROC_DIR faz o prometheus_client
+# gravar os valores em arquivos mmap por processo; o /metrics agrega todos eles.
+# Os coletores padrão (process_*, python_gc_*) descreveriam só o worker que
+# atendeu o scrape e ficam de fora; python_info é igual em todos e é mantido
+if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+    METRICS_REGISTRY = CollectorRegistry()
+    multiprocess.MultiProcessCollector(METRICS_REGISTRY)
+    PlatformCollector(registry=METRICS_REGISTRY)
+else:
+    METRICS_REGISTRY = REGISTRY
+
+# Endpoints instrumentados (o próprio /metrics fica de fora)
+TRACKED_ENDPOINTS = [('GET', '/'), ('GET', '/status'), ('POST', '/submit')]
+# Endpoints servidos apenas pela API completa
+EXTRA_ENDPOINTS = {'/status', '/submit'}
+
+# Corpos e cabeçalhos pré-computados das respostas constantes
+HELLO_BODY = b"Hello, World!"
+HELLO_HEADERS = {"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(HELLO_BODY))}
+STATUS_BODY = orjson.dumps({"status": "OK", "message": "Serviço em funcionamento"})
+STATUS_HEADERS = {"Content-Type": "application/json", "Content-Length": str(len(STATUS_BODY))}
+
+# Intervalo (s) da amostragem de processo feita em background
+SAMPLE_INTERVAL = 1
+# Tempo (s) em que o corpo do /metrics é reaproveitado entre scrapes
+METRICS_CACHE_TTL = 0.9
+
+_sampler_started = False
+_request_latency = None
+
+def get_request_latency():
+    """Cria o histograma de latência das requisições na primeira chamada."""
+    # Só registrado quando pedido, para a variante mínima não expor uma família vazia
+    global _request_latency
+    if _request_latency is None:
+        _request_latency = Histogram('http_request_duration_seconds', 'Duração das requisições HTTP',
+                                     ['method', 'endpoint'],
+                                     buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+    return _request_latency
+
+def start_process_sampler():
+    """Cria as métricas de CPU/memória/threads e as atualiza em background."""
+    # Executa no máximo uma vez por processo
+    global _sampler_started
+    if _sampler_started:
+        return
+    _sampler_started = True
+
+    # Somadas entre os workers vivos em modo multiprocesso
+    process = psutil.Process()
+    cpu_usage = Gauge('python_process_cpu_percent', 'Uso de CPU pelo processo (%)',
+                      multiprocess_mode='livesum')
+    memory_usage = Gauge('python_process_memory_bytes', 'Uso de memória pelo processo (bytes)',
+                         multiprocess_mode='livesum')
+    thread_count = Gauge('python_process_threads', 'Número de threads do processo',
+                         multiprocess_mode='livesum')
+
+    # cpu_percent(interval=None) não bloqueia e mede desde a última chamada
+    def sample():
+        while True:
+            cpu_usage.set(process.cpu_percent(interval=None))
+            memory_usage.set(process.memory_info().rss)
+            thread_count.set(process.num_threads())
+            time.sleep(SAMPLE_INTERVAL)
+
+    threading.Thread(target=sample, daemon=True).start()
+
+def create_app(with_latency_histogram=True, with_process_metrics=True, with_extra_endpoints=True):
+    """Cria a API de exemplo instrumentada com métricas do Prometheus."""
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    if with_process_metrics:
+        start_process_sampler()
+    request_latency = get_request_latency() if with_latency_histogram else None
+
+    # Séries resolvidas uma única vez por (método, endpoint) instrumentado
+    tracked_metrics = {
+        (method, endpoint): (REQUEST_COUNT.labels(method=method, endpoint=endpoint),
+                             request_latency.labels(method=method, endpoint=endpoint)
+                             if request_latency is not None else None)
+        for method, endpoint in TRACKED_ENDPOINTS
+        if with_extra_endpoints or endpoint not in EXTRA_ENDPOINTS
+    }
+
+    # Middleware para medir a latência das requisições
+    @app.middleware("http")
+    async def track_request_metrics(request: Request, call_next):
+        # Mede o tempo de execução
+        start_time = time.perf_counter()
+        try:
+            return await call_next(request)
+        finally:
+            # Registra também as requisições que terminaram em exceção
+            duration = time.perf_counter() - start_time
+
+            # Usa o path da rota (e não a URL) para manter a cardinalidade dos labels
+            route = request.scope.get('route')
+            children = tracked_metrics.get((request.method, getattr(route, 'path', None)))
+            if children is not None:
+                count, latency = children
+                # Incrementa o contador e registra a duração no histograma
+                count.inc()
+                if latency is not None:
+                    latency.observe(duration)
+
+    @app.get('/')
+    async def index():
+        return Response(HELLO_BODY, headers=HELLO_HEADERS)
+
+    if with_extra_endpoints:
+        @app.get('/status')
+        async def status():
+            return Response(STATUS_BODY, status_code=200, headers=STATUS_HEADERS)
+
+        @app.post('/submit')
+        async def submit(request: Request):
+            try:
+                data = orjson.loads(await request.body())
+            except orjson.JSONDecodeError:
+                return ORJSONResponse({"message": "JSON inválido"}, status_code=400)
+            return ORJSONResponse({"message": "Dados recebidos", "data": data}, status_code=201)
+
+    # Cache da última exposição: rajadas de scrapes reaproveitam o mesmo corpo
+    metrics_cache = {"ts": float('-inf'), "body": b""}
+
+    @app.get('/metrics')
+    async def metrics():
+        now = time.monotonic()
+        if now - metrics_cache["ts"] > METRICS_CACHE_TTL:
+            metrics_cache["body"] = generate_latest(METRICS_REGISTRY)
+            metrics_cache["ts"] = now
+        return Response(metrics_cache["body"], media_type=CONTENT_TYPE_LATEST)
+
+    return app
@@ -0,0 +1,31 @@
+import multiprocessing
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# Configuração do gunicorn para a API de exemplo
+bind = "0.0.0.0:5000"
+
+# Workers ASGI (uvicorn com uvloop e httptools) dimensionados pelo número de CPUs
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 30
+
+# Logs no stdout/stderr do container
+accesslog = "-"
+errorlog = "-"
+
+# Diretório das métricas compartilhadas entre os workers (modo multiprocesso)
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+def on_starting(server):
+    # Descarta métricas de execuções anteriores
+    if PROMETHEUS_MULTIPROC_DIR:
+        shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(PROMETHEUS_MULTIPROC_DIR)
+
+def child_exit(server, worker):
+    # Remove os gauges "live" do worker que saiu
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(worker.pid)
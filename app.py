@@ -1,19 +1,10 @@
-from flask import Flask
-from prometheus_client import Counter, generate_latest
-from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY
+from api.factory import create_app
 
-app = Flask(__name__)
-
-REQUEST_COUNT = Counter('http_requests_total', 'Total de requisições', ['method', 'endpoint'])
-
-@app.route('/')
-def index():
-    REQUEST_COUNT.labels(method='GET', endpoint='/').inc()
-    return "Hello, World!"
-
-@app.route('/metrics')
-def metrics():
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+# Variante mínima da API de exemplo: só / e /metrics, com o contador de requisições
+app = create_app(with_latency_histogram=False, with_process_metrics=False, with_extra_endpoints=False)
 
+# Servidor de desenvolvimento apenas para depuração local;
+# em produção use: gunicorn -c api/gunicorn_conf.py app:app
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000)
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
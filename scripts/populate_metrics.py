@@ -22,11 +22,11 @@ REQUEST_TIMEOUT = 5                # Timeout for each request in seconds
 async def make_request(session, endpoint):
     """Make a single request to an endpoint."""
     url = f"{API_URL}{endpoint}"
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         async with session.get(url) as response:
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             status = response.status
             if status == 200:
                 logger.info(f"Success: {url} - {status} - {elapsed:.2f}s")
@@ -34,7 +34,7 @@ async def make_request(session, endpoint):
                 logger.error(f"Failed: {url} - {status} - {elapsed:.2f}s")
             return status
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         logger.error(f"Error: {url} - {str(e)} - {elapsed:.2f}s")
         return None
 
@@ -72,11 +72,11 @@ async def generate_load():
             workers.append(task)
         
         # Start time for the test
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Generate load until the test duration is reached
         try:
-            while time.time() - start_time < TEST_DURATION:
+            while time.monotonic() - start_time < TEST_DURATION:
                 endpoint = random.choice(ENDPOINTS)
                 await request_queue.put(endpoint)
                 # Small delay to avoid overloading the queue
@@ -93,7 +93,7 @@ async def generate_load():
         await asyncio.gather(*workers)
     
     # Calculate and log results
-    total_time = time.time() - start_time
+    total_time = time.monotonic() - start_time
     requests_per_second = results["total"] / total_time
     success_rate = (results["success"] / results["total"]) * 100 if results["total"] > 0 else 0
     
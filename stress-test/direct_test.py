@@ -1,9 +1,9 @@
 import asyncio
 import random
 import time
-import aiohttp
-from aiohttp import ClientSession, ClientTimeout
+import httpx
 import logging
+import uvloop
 
 # Configure logging
 logging.basicConfig(
@@ -18,27 +18,36 @@ ENDPOINTS = ["/", "/metrics"]       # Endpoints to call
 CONCURRENT_REQUESTS = 50            # Number of simultaneous connections
 TEST_DURATION = 30                  # Test duration in seconds
 REQUEST_TIMEOUT = 5                 # Timeout for each request in seconds
+SELECTION_BATCH_SIZE = 4096         # Endpoints drawn per random.choices() call
 
-async def make_request(session, endpoint):
+async def make_request(client, endpoint):
     """Make a single request to an endpoint."""
     url = f"{API_URL}{endpoint}"
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        async with session.get(url) as response:
-            elapsed = time.time() - start_time
-            status = response.status
-            if status == 200:
-                logger.info(f"Success: {url} - {status} - {elapsed:.2f}s")
-            else:
-                logger.error(f"Failed: {url} - {status} - {elapsed:.2f}s")
-            return status
+        response = await client.get(url)
+        elapsed = time.perf_counter() - start_time
+        status = response.status_code
+        # Successes are only reported in aggregate by stats_printer
+        if status != 200:
+            logger.error(f"Failed: {url} - {status} - {elapsed:.2f}s")
+        return status
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         logger.error(f"Error: {url} - {str(e)} - {elapsed:.2f}s")
         return None
 
-async def worker(session, request_queue, results):
+async def stats_printer(results, start_time, interval=1.0):
+    """Periodically log aggregate progress of the running test."""
+    while True:
+        await asyncio.sleep(interval)
+        if logger.isEnabledFor(logging.INFO):
+            elapsed = time.monotonic() - start_time
+            logger.info(f"Progress: {results['total']} requests, {results['failed']} failed - "
+                        f"{results['total'] / elapsed:.2f} req/s")
+
+async def worker(client, request_queue, results):
     """Worker that processes requests from the queue."""
     while True:
         endpoint = await request_queue.get()
@@ -46,7 +55,7 @@ async def worker(session, request_queue, results):
             request_queue.task_done()
             break
             
-        status = await make_request(session, endpoint)
+        status = await make_request(client, endpoint)
         results["total"] += 1
         if status == 200:
             results["success"] += 1
@@ -58,30 +67,39 @@ async def worker(session, request_queue, results):
 async def generate_load():
     """Generate load by pushing requests to the queue."""
     results = {"total": 0, "success": 0, "failed": 0}
-    request_queue = asyncio.Queue()
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
+    # Bounded queue: the generator blocks once workers fall behind (backpressure)
+    request_queue = asyncio.Queue(maxsize=CONCURRENT_REQUESTS * 4)
+    timeout = httpx.Timeout(REQUEST_TIMEOUT)
+    # Keep-alive pool sized to the concurrency so connections are reused
+    limits = httpx.Limits(
+        max_connections=CONCURRENT_REQUESTS * 2,
+        max_keepalive_connections=CONCURRENT_REQUESTS
+    )
     
     logger.info(f"Starting stress test with {CONCURRENT_REQUESTS} concurrent connections")
     logger.info(f"Test will run for {TEST_DURATION} seconds")
     logger.info(f"Target API URL: {API_URL}")
     
-    async with ClientSession(timeout=timeout) as session:
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, http2=True) as client:
         # Create worker tasks
         workers = []
         for _ in range(CONCURRENT_REQUESTS):
-            task = asyncio.create_task(worker(session, request_queue, results))
+            task = asyncio.create_task(worker(client, request_queue, results))
             workers.append(task)
         
         # Start time for the test
-        start_time = time.time()
+        start_time = time.monotonic()
+        deadline = start_time + TEST_DURATION
+        printer = asyncio.create_task(stats_printer(results, start_time))
+        rng = random.Random()
         
         # Generate load until the test duration is reached
         try:
-            while time.time() - start_time < TEST_DURATION:
-                endpoint = random.choice(ENDPOINTS)
-                await request_queue.put(endpoint)
-                # Small delay to avoid overloading the queue
-                await asyncio.sleep(0.01)
+            while time.monotonic() < deadline:
+                for endpoint in rng.choices(ENDPOINTS, k=SELECTION_BATCH_SIZE):
+                    if time.monotonic() >= deadline:
+                        break
+                    await request_queue.put(endpoint)
         
         except KeyboardInterrupt:
             logger.info("Test interrupted by user")
@@ -92,9 +110,10 @@ async def generate_load():
         
         # Wait for all workers to finish
         await asyncio.gather(*workers)
+        printer.cancel()
     
     # Calculate and log results
-    total_time = time.time() - start_time
+    total_time = time.monotonic() - start_time
     requests_per_second = results["total"] / total_time
     success_rate = (results["success"] / results["total"]) * 100 if results["total"] > 0 else 0
     
@@ -106,4 +125,5 @@ async def generate_load():
     logger.info(f"Success rate: {success_rate:.2f}%")
 
 if __name__ == "__main__":
+    uvloop.install()
     asyncio.run(generate_load()) 
\ No newline at end of file
@@ -1,12 +1,16 @@
 import asyncio
+import itertools
 import random
+import sys
 import time
-import aiohttp
-import threading
+from collections import Counter
+import httpx
+import orjson
+import uvicorn
 import json
 import logging
-from aiohttp import ClientSession, ClientTimeout
-from flask import Flask, request, jsonify, Response
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response
 
 # Configure logging
 logging.basicConfig(
@@ -29,93 +33,111 @@ DEFAULT_CONFIG = {
     "use_weights": True                   # Whether to use endpoint weights for distribution
 }
 
-# Global state
+# Number of endpoint selections drawn per random.choices() call
+SELECTION_BATCH_SIZE = 4096
+# Maximum number of requests a single worker keeps in flight
+WORKER_BATCH_SIZE = 8
+
+# Global state (only touched from the server's event loop, so no locking is needed)
 current_config = DEFAULT_CONFIG.copy()
 last_test_results = None
-is_test_running = False
-test_lock = threading.Lock()
+current_test = None  # asyncio.Task of the running load test
 
 # Core test functionality
-async def make_request(session, endpoint_config, api_url):
+async def make_request(client, endpoint_config, api_url):
     """Make a single request to an endpoint."""
     path = endpoint_config["path"]
     method = endpoint_config["method"]
     data = endpoint_config.get("data")
     
     url = f"{api_url}{path}"
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         if method == "GET":
-            async with session.get(url) as response:
-                elapsed = time.time() - start_time
-                status = response.status
-                if status == 200:
-                    logger.info(f"Success: GET {url} - {status} - {elapsed:.2f}s")
-                else:
-                    logger.error(f"Failed: GET {url} - {status} - {elapsed:.2f}s")
-                return status
+            response = await client.get(url)
+            elapsed = time.perf_counter() - start_time
+            status = response.status_code
+            # Successes are only reported in aggregate by stats_printer
+            if status != 200:
+                logger.error(f"Failed: GET {url} - {status} - {elapsed:.2f}s")
+            return status
         elif method == "POST":
-            async with session.post(url, json=data) as response:
-                elapsed = time.time() - start_time
-                status = response.status
-                if status == 200:
-                    logger.info(f"Success: POST {url} - {status} - {elapsed:.2f}s")
-                else:
-                    logger.error(f"Failed: POST {url} - {status} - {elapsed:.2f}s")
-                return status
+            response = await client.post(url, json=data)
+            elapsed = time.perf_counter() - start_time
+            status = response.status_code
+            if status != 200:
+                logger.error(f"Failed: POST {url} - {status} - {elapsed:.2f}s")
+            return status
         else:
             logger.error(f"Unsupported method: {method}")
             return None
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         logger.error(f"Error: {method} {url} - {str(e)} - {elapsed:.2f}s")
         return None
 
-async def worker(session, request_queue, results, api_url):
-    """Worker that processes requests from the queue."""
+async def stats_printer(results, start_time, interval=1.0):
+    """Periodically log aggregate progress of the running test."""
     while True:
-        try:
-            # Get a task from the queue
-            endpoint_config = await request_queue.get()
+        await asyncio.sleep(interval)
+        if logger.isEnabledFor(logging.INFO):
+            elapsed = time.monotonic() - start_time
+            logger.info(f"Progress: {results['total']} requests, {results['failed']} failed - "
+                        f"{results['total'] / elapsed:.2f} req/s")
+
+async def worker(client, request_queue, counts, endpoint_counts, api_url, batch_cap):
+    """Worker that processes mini-batches of up to batch_cap requests from the queue."""
+    stop = False
+    while not stop:
+        # Wait for one endpoint, then grab whatever else is already queued
+        batch = []
+        pulled = 0
+        endpoint_config = await request_queue.get()
+        while True:
+            pulled += 1
             if endpoint_config is None:  # Sentinel value to stop the worker
-                request_queue.task_done()
+                stop = True
                 break
-                
-            # Make the request
-            status = await make_request(session, endpoint_config, api_url)
+            batch.append(endpoint_config)
+            if len(batch) >= batch_cap or request_queue.empty():
+                break
+            endpoint_config = request_queue.get_nowait()
+        
+        try:
+            # Keep the whole batch in flight at once
+            statuses = await asyncio.gather(
+                *(make_request(client, ec, api_url) for ec in batch)
+            )
             
-            # Update overall results
-            results["total"] += 1
-            if status == 200:
-                results["success"] += 1
-            else:
-                results["failed"] += 1
+            # Update overall results once per batch (Counter tallies the iterable in C)
+            outcomes = ["success" if status == 200 else "failed" for status in statuses]
+            counts["total"] += len(outcomes)
+            counts.update(outcomes)
             
-            # Update per-endpoint statistics if not already tracking
-            endpoint_key = f"{endpoint_config['method']}:{endpoint_config['path']}"
-            if "endpoint_stats" not in results:
-                results["endpoint_stats"] = {}
-                
-            if endpoint_key not in results["endpoint_stats"]:
-                results["endpoint_stats"][endpoint_key] = {"total": 0, "success": 0, "failed": 0}
-                
-            results["endpoint_stats"][endpoint_key]["total"] += 1
-            if status == 200:
-                results["endpoint_stats"][endpoint_key]["success"] += 1
-            else:
-                results["endpoint_stats"][endpoint_key]["failed"] += 1
-                
-            request_queue.task_done()
+            # Update per-endpoint statistics (pre-seeded by run_load_test)
+            batch_keys = (endpoint_config["_key"] for endpoint_config in batch)
+            for (key, outcome), n in Counter(zip(batch_keys, outcomes)).items():
+                stats = endpoint_counts[key]
+                stats["total"] += n
+                stats[outcome] += n
         except Exception as e:
             logger.error(f"Worker error: {str(e)}")
-            request_queue.task_done()
+        finally:
+            for _ in range(pulled):
+                request_queue.task_done()
 
 async def run_load_test(config):
     """Execute the load test with the given configuration."""
-    results = {"total": 0, "success": 0, "failed": 0}
-    request_queue = asyncio.Queue()
-    timeout = ClientTimeout(total=config["request_timeout"])
+    counts = Counter(total=0, success=0, failed=0)
+    # Bounded queue: the generator blocks once workers fall behind (backpressure)
+    request_queue = asyncio.Queue(maxsize=config["concurrent_requests"] * 4)
+    timeout = httpx.Timeout(config["request_timeout"])
+    # Keep-alive pool sized to the concurrency so connections are reused
+    limits = httpx.Limits(
+        max_connections=config["concurrent_requests"] * 2,
+        max_keepalive_connections=config["concurrent_requests"]
+    )
     
     logger.info(f"Starting stress test with {config['concurrent_requests']} concurrent connections")
     logger.info(f"Test will run for {config['test_duration']} seconds")
@@ -125,64 +147,68 @@ async def run_load_test(config):
     endpoint_list = [f"{e['method']} {e['path']} (weight: {e.get('weight', 1)})" for e in config['endpoints']]
     logger.info(f"Target endpoints: {endpoint_list}")
     
+    # Work on copies tagged with their (interned) stats key so workers don't format it per request
+    endpoints = [dict(e, _key=sys.intern(f"{e['method']}:{e['path']}")) for e in config['endpoints']]
+    endpoint_counts = {e["_key"]: Counter(total=0, success=0, failed=0) for e in endpoints}
+    
     # Prepare weighted distribution if enabled
     use_weights = config.get("use_weights", True)
+    cum_weights = None  # None means equal probability for every endpoint
     if use_weights:
-        # Create weighted distribution for endpoint selection
-        endpoints = config['endpoints']
-        weights = [endpoint.get('weight', 1) for endpoint in endpoints]
-        total_weight = sum(weights)
+        # Precompute cumulative weights once so each selection is a bisect in C
+        cum_weights = list(itertools.accumulate(endpoint.get('weight', 1) for endpoint in endpoints))
+        total_weight = cum_weights[-1] if cum_weights else 0
         logger.info(f"Using weighted distribution with total weight: {total_weight}")
+        if total_weight <= 0:
+            cum_weights = None
     
-    connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300)
-    async with ClientSession(timeout=timeout, connector=connector) as session:
+    # Each worker keeps up to WORKER_BATCH_SIZE requests in flight; the last one
+    # takes the remainder, so the caps add up to exactly concurrent_requests
+    concurrency = config['concurrent_requests']
+    num_workers = -(-concurrency // WORKER_BATCH_SIZE)
+    batch_caps = [WORKER_BATCH_SIZE] * (num_workers - 1) + [concurrency - (num_workers - 1) * WORKER_BATCH_SIZE]
+    
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, http2=True) as client:
         # Create worker tasks
         workers = []
-        for _ in range(config['concurrent_requests']):
+        for batch_cap in batch_caps:
             task = asyncio.create_task(
-                worker(session, request_queue, results, config['api_url'])
+                worker(client, request_queue, counts, endpoint_counts, config['api_url'], batch_cap)
             )
             workers.append(task)
         
         # Start time for the test
-        start_time = time.time()
+        start_time = time.monotonic()
+        deadline = start_time + config['test_duration']
+        printer = asyncio.create_task(stats_printer(counts, start_time))
+        rng = random.Random()
         
         # Generate load until the test duration is reached
         try:
-            while time.time() - start_time < config['test_duration']:
-                # Select an endpoint configuration based on weights or randomly
-                if use_weights and total_weight > 0:
-                    # Weighted random selection
-                    r = random.uniform(0, total_weight)
-                    cumulative_weight = 0
-                    selected_endpoint = config['endpoints'][0]
-                    
-                    for i, endpoint in enumerate(config['endpoints']):
-                        cumulative_weight += endpoint.get('weight', 1)
-                        if r <= cumulative_weight:
-                            selected_endpoint = endpoint
-                            break
-                else:
-                    # Simple random selection (equal probability)
-                    selected_endpoint = random.choice(config['endpoints'])
-                
-                await request_queue.put(selected_endpoint)
+            while time.monotonic() < deadline:
+                # Select a large batch of endpoint configurations in one C-level call
+                batch = rng.choices(endpoints, cum_weights=cum_weights, k=SELECTION_BATCH_SIZE)
                 
-                # Add randomness to request timing
-                await asyncio.sleep(random.uniform(0.001, 0.02))
+                for selected_endpoint in batch:
+                    if time.monotonic() >= deadline:
+                        break
+                    await request_queue.put(selected_endpoint)
         
         except Exception as e:
             logger.error(f"Test error during request generation: {str(e)}")
         
         # Send sentinel values to stop workers
-        for _ in range(config['concurrent_requests']):
+        for _ in range(num_workers):
             await request_queue.put(None)
         
         # Wait for all workers to finish
         await asyncio.gather(*workers)
+        printer.cancel()
     
     # Calculate and log results
-    total_time = time.time() - start_time
+    results = dict(counts)
+    results["endpoint_stats"] = {key: dict(stats) for key, stats in endpoint_counts.items()}
+    total_time = time.monotonic() - start_time
     requests_per_second = results["total"] / total_time if total_time > 0 else 0
     success_rate = (results["success"] / results["total"]) * 100 if results["total"] > 0 else 0
     
@@ -192,10 +218,9 @@ async def run_load_test(config):
     results["success_rate"] = round(success_rate, 2)
     
     # Track per-endpoint statistics
-    if "endpoint_stats" in results:
-        for endpoint, stats in results["endpoint_stats"].items():
-            if stats["total"] > 0:
-                stats["success_rate"] = round((stats["success"] / stats["total"]) * 100, 2)
+    for endpoint, stats in results["endpoint_stats"].items():
+        if stats["total"] > 0:
+            stats["success_rate"] = round((stats["success"] / stats["total"]) * 100, 2)
     
     logger.info(f"Test completed in {total_time:.2f} seconds")
     logger.info(f"Total requests: {results['total']}")
@@ -206,55 +231,66 @@ async def run_load_test(config):
     
     return results
 
-# Thread management
-def execute_test_in_thread():
-    """Execute the test in a background thread."""
-    global is_test_running, last_test_results, current_config
+def validate_config(config):
+    """Raise ValueError when config cannot drive a test.
     
-    with test_lock:
-        if is_test_running:
-            logger.warning("Test already running, ignoring request")
-            return False
-        is_test_running = True
+    At least one worker and a bounded request queue (maxsize > 0) are needed,
+    otherwise the producer never yields and starves the server's event loop.
+    """
+    concurrency = config.get("concurrent_requests")
+    if type(concurrency) is not int or concurrency < 1:
+        raise ValueError("concurrent_requests must be an integer >= 1")
+    for key in ("test_duration", "request_timeout"):
+        value = config.get(key)
+        if type(value) not in (int, float) or not value > 0:
+            raise ValueError(f"{key} must be a number > 0")
+    if not isinstance(config.get("api_url"), str):
+        raise ValueError("api_url must be a string")
+    if not isinstance(config.get("endpoints"), list) or not config["endpoints"]:
+        raise ValueError("endpoints must be a non-empty list")
+
+# Test task management
+def is_test_running():
+    """Whether a load test task is currently in progress."""
+    return current_test is not None and not current_test.done()
+
+async def run_and_store(config):
+    """Run a load test and keep its results for /status."""
+    global last_test_results
+    try:
+        last_test_results = await run_load_test(config)
+    except Exception as e:
+        logger.error(f"Error in test task: {str(e)}")
+
+def start_test_task():
+    """Start the test as a background task on the server's event loop."""
+    global current_test
     
-    def run():
-        global is_test_running, last_test_results
-        
-        # Create new event loop for the thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            # Use a thread-local copy of the configuration
-            with test_lock:
-                config = current_config.copy()
-            
-            # Run the test
-            results = loop.run_until_complete(run_load_test(config))
-            
-            # Store results
-            with test_lock:
-                last_test_results = results
-        except Exception as e:
-            logger.error(f"Error in test thread: {str(e)}")
-        finally:
-            with test_lock:
-                is_test_running = False
-            loop.close()
+    if is_test_running():
+        logger.warning("Test already running, ignoring request")
+        return False
     
-    # Start the test in a new thread
-    thread = threading.Thread(target=run)
-    thread.daemon = True
-    thread.start()
+    # The task gets its own copy of the configuration
+    current_test = asyncio.create_task(run_and_store(current_config.copy()))
     return True
 
-# Flask application
-app = Flask(__name__)
+# JSON helpers backed by orjson (much faster than the stdlib json module)
+def json_response(obj, status_code=200):
+    """Serialize obj with orjson into a JSON response."""
+    return Response(orjson.dumps(obj), status_code=status_code, media_type='application/json')
 
-@app.route('/', methods=['GET'])
-def home():
+async def parse_json_body(request):
+    """Parse the request body with orjson, returning None when it is empty."""
+    body = await request.body()
+    return orjson.loads(body) if body else None
+
+# FastAPI application
+app = FastAPI()
+
+@app.get('/')
+async def home():
     """Home endpoint with service information."""
-    return jsonify({
+    return json_response({
         "service": "API Load Test Service",
         "status": "running",
         "endpoints": {
@@ -265,132 +301,136 @@ def home():
         }
     })
 
-@app.route('/config', methods=['GET', 'POST'])
-def config():
+@app.api_route('/config', methods=['GET', 'POST'])
+async def config(request: Request):
     """Get or update the test configuration."""
-    global current_config
-    
     if request.method == 'POST':
         try:
-            new_config = request.get_json()
+            new_config = await parse_json_body(request)
             if not new_config:
-                return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+                return json_response({"status": "error", "message": "Invalid JSON data"}, 400)
             
-            with test_lock:
-                if is_test_running:
-                    return jsonify({"status": "error", "message": "Cannot update config while test is running"}), 400
-                
-                # Update only valid configuration parameters
-                for key, value in new_config.items():
-                    if key in current_config:
-                        current_config[key] = value
+            if is_test_running():
+                return json_response({"status": "error", "message": "Cannot update config while test is running"}, 400)
+            
+            # Update only valid configuration parameters, once the result is known to be usable
+            updated = dict(current_config)
+            for key, value in new_config.items():
+                if key in updated:
+                    updated[key] = value
+            validate_config(updated)
+            current_config.update(updated)
             
-            return jsonify({"status": "success", "config": current_config})
+            return json_response({"status": "success", "config": current_config})
+        except ValueError as e:
+            # Invalid JSON or configuration values
+            return json_response({"status": "error", "message": str(e)}, 400)
         except Exception as e:
             logger.error(f"Error updating config: {str(e)}")
-            return jsonify({"status": "error", "message": str(e)}), 500
+            return json_response({"status": "error", "message": str(e)}, 500)
     
     # GET request - return current configuration
-    return jsonify(current_config)
+    return json_response(current_config)
 
-@app.route('/start-test', methods=['POST'])
-def start_test():
+@app.post('/start-test')
+async def start_test():
     """Start a load test with the current configuration."""
-    with test_lock:
-        if is_test_running:
-            return jsonify({"status": "error", "message": "A test is already running"}), 400
+    if is_test_running():
+        return json_response({"status": "error", "message": "A test is already running"}, 400)
     
     try:
         # Start the test
-        success = execute_test_in_thread()
+        success = start_test_task()
         
         if success:
-            return jsonify({
+            return json_response({
                 "status": "success", 
                 "message": "Test started", 
                 "config": current_config
             })
         else:
-            return jsonify({
+            return json_response({
                 "status": "error", 
                 "message": "Failed to start test, another test may be running"
-            }), 400
+            }, 400)
     except Exception as e:
         logger.error(f"Error starting test: {str(e)}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return json_response({"status": "error", "message": str(e)}, 500)
 
-@app.route('/status', methods=['GET'])
-def test_status():
+@app.get('/status')
+async def test_status():
     """Get the current test status and results."""
-    with test_lock:
-        if is_test_running:
-            return jsonify({
-                "status": "running",
-                "config": current_config
-            })
-        elif last_test_results:
-            return jsonify({
-                "status": "completed",
-                "results": last_test_results,
-                "config": current_config
-            })
-        else:
-            return jsonify({
-                "status": "idle",
-                "config": current_config
-            })
+    if is_test_running():
+        return json_response({
+            "status": "running",
+            "config": current_config
+        })
+    elif last_test_results:
+        return json_response({
+            "status": "completed",
+            "results": last_test_results,
+            "config": current_config
+        })
+    else:
+        return json_response({
+            "status": "idle",
+            "config": current_config
+        })
 
-@app.route('/run-test', methods=['POST'])
-def run_test():
+@app.post('/run-test')
+async def run_test(request: Request):
     """Run a test with specified parameters."""
-    global current_config
-    
-    with test_lock:
-        if is_test_running:
-            return jsonify({"status": "error", "message": "A test is already running"}), 400
+    if is_test_running():
+        return json_response({"status": "error", "message": "A test is already running"}, 400)
     
     try:
         # Get test parameters
-        data = request.get_json() or {}
+        data = await parse_json_body(request) or {}
         
-        # Configure the test
-        with test_lock:
-            # Update basic configuration
-            current_config["api_url"] = data.get("api_url", "http://target-api:5000")
-            current_config["test_duration"] = data.get("seconds", 30)
-            current_config["concurrent_requests"] = data.get("requests", 50)
-            current_config["request_timeout"] = data.get("timeout", 5)
-            current_config["use_weights"] = data.get("use_weights", True)
-            
-            # If custom endpoints are provided, use them
-            if "endpoints" in data:
-                current_config["endpoints"] = data["endpoints"]
-            # Otherwise, use the default set
-            elif "reset_endpoints" in data and data["reset_endpoints"]:
-                current_config["endpoints"] = DEFAULT_CONFIG["endpoints"]
+        # Update basic configuration
+        updated = dict(current_config)
+        updated["api_url"] = data.get("api_url", "http://target-api:5000")
+        updated["test_duration"] = data.get("seconds", 30)
+        updated["concurrent_requests"] = data.get("requests", 50)
+        updated["request_timeout"] = data.get("timeout", 5)
+        updated["use_weights"] = data.get("use_weights", True)
+        
+        # If custom endpoints are provided, use them
+        if "endpoints" in data:
+            updated["endpoints"] = data["endpoints"]
+        # Otherwise, use the default set
+        elif "reset_endpoints" in data and data["reset_endpoints"]:
+            updated["endpoints"] = DEFAULT_CONFIG["endpoints"]
+        
+        # Only apply the parameters once they are known to be usable
+        validate_config(updated)
+        current_config.update(updated)
         
         # Start the test
-        success = execute_test_in_thread()
+        success = start_test_task()
         
         if success:
-            return jsonify({
+            return json_response({
                 "status": "success", 
                 "message": "Test started", 
                 "config": current_config
             })
         else:
-            return jsonify({
+            return json_response({
                 "status": "error", 
                 "message": "Failed to start test"
-            }), 500
+            }, 500)
+    except ValueError as e:
+        # Invalid JSON or test parameters
+        return json_response({"status": "error", "message": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error starting test: {str(e)}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return json_response({"status": "error", "message": str(e)}, 500)
 
-@app.route('/health', methods=['GET'])
-def health_check():
+@app.get('/health')
+async def health_check():
     """Simple health check endpoint for Docker."""
-    return Response("OK", status=200)
+    return PlainTextResponse("OK", status_code=200)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8080, debug=False)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8080, workers=1, loop="uvloop")
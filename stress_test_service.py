@@ -1,121 +1,265 @@
 import asyncio
-import time
+import functools
+import atexit
+import itertools
+import multiprocessing
+import os
+import queue
+from time import monotonic, perf_counter
+import sys
 import aiohttp
-import threading
-import json
 import logging
+import logging.handlers
+import numpy as np
+import orjson
+import uvicorn
 from aiohttp import ClientSession, ClientTimeout
-from flask import Flask, request, jsonify, Response
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, fields, replace
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response
 
-# Configure logging
+# Prefer uvloop for the load-generator loop; fall back to stdlib asyncio
+# where it is unavailable (e.g. Windows)
+try:
+    import uvloop
+    new_event_loop = uvloop.new_event_loop
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
+
+# Configure logging; records are only queued on the calling thread and written
+# to stderr by a listener thread, so logging never blocks the event loop
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(message)s',  # Only merges the message; the listener's handler adds the rest
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Test configuration snapshot; frozen so it can be shared without copying.
+# slots=True needs Python 3.10+
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
+class TestConfig:
+    api_url: str = "http://target-api:5000"  # URL of the API
+    endpoint: str = "/"                      # Endpoint to call - simplified to just one endpoint
+    concurrent_requests: int = 50            # Number of simultaneous connections
+    test_duration: int = 30                  # Test duration in seconds
+    request_timeout: int = 5                 # Timeout for each request in seconds
+    
+    def __post_init__(self):
+        # Rejects values that would only fail once the test is already running
+        for name in ("api_url", "endpoint"):
+            if not isinstance(getattr(self, name), str):
+                raise ValueError(f"{name} must be a string")
+        if type(self.concurrent_requests) is not int or self.concurrent_requests < 1:
+            raise ValueError("concurrent_requests must be an integer >= 1")
+        for name in ("test_duration", "request_timeout"):
+            value = getattr(self, name)
+            if type(value) not in (int, float) or not value > 0:
+                raise ValueError(f"{name} must be a number > 0")
+
 # Default configuration
-DEFAULT_CONFIG = {
-    "api_url": "http://target-api:5000",  # URL of the API
-    "endpoint": "/",                      # Endpoint to call - simplified to just one endpoint
-    "concurrent_requests": 50,            # Number of simultaneous connections
-    "test_duration": 30,                  # Test duration in seconds
-    "request_timeout": 5                  # Timeout for each request in seconds
-}
-
-# Global state
-current_config = DEFAULT_CONFIG.copy()
+DEFAULT_CONFIG = TestConfig()
+# Names accepted by POST /config
+CONFIG_FIELDS = frozenset(field.name for field in fields(TestConfig))
+
+# Number of requests each worker keeps in flight per asyncio.gather() batch
+REQUEST_BATCH_SIZE = 16
+# Number of load-generator processes, each running its own event loop
+PROCESS_COUNT = os.cpu_count() or 1
+# Latency samples kept per process; once full, the oldest samples are overwritten
+LATENCY_BUFFER_SIZE = 1 << 20
+
+# Global state (only touched from the server's event loop, so no locking is needed)
+# current_config is a frozen snapshot: it is replaced, never mutated, so a
+# running test and the cached /status body can hold on to it
+current_config = DEFAULT_CONFIG
 last_test_results = None
-is_test_running = False
-test_lock = threading.Lock()
+current_test = None  # asyncio.Task of the running load test
+
+# Long-lived pool of load-generator processes
+process_pool = None
+# Shared (total, success) counter pair per partition, written by the pool
+# processes while a test runs and summed by /status
+live_counters = None
+
+# Per pool process: long-lived event loop and pooled session shared by all
+# tests, so the DNS cache and keep-alive connections survive between runs
+partition_loop = None
+session = None
+session_key = None  # (concurrent_requests, request_timeout) the session was built for
 
 # Core test functionality
-async def make_request(session, endpoint, api_url):
-    """Make a single request to an endpoint."""
-    url = f"{api_url}{endpoint}"
-    start_time = time.time()
+def make_request_fn(get, url, latencies, slot):
+    """Build the request coroutine function for one test.
     
-    try:
-        async with session.get(url) as response:
-            elapsed = time.time() - start_time
-            status = response.status
-            if status == 200:
-                logger.info(f"Success: {url} - {status} - {elapsed:.2f}s")
-            else:
-                logger.error(f"Failed: {url} - {status} - {elapsed:.2f}s")
-            return status
-    except Exception as e:
-        elapsed = time.time() - start_time
-        logger.error(f"Error: {url} - {str(e)} - {elapsed:.2f}s")
-        return None
-
-async def worker(session, request_queue, results, api_url, endpoint):
-    """Worker that processes requests from the queue."""
-    while True:
+    Everything constant for the test is bound as a default argument, so each
+    call only loads fast locals. The latency of every answered request is
+    written into the next slot of the latencies ring buffer.
+    """
+    async def _do(_get=get, _url=url, _perf=perf_counter, _latencies=latencies,
+                  _next_slot=slot.__next__, _size=LATENCY_BUFFER_SIZE,
+                  _log_errors=logger.isEnabledFor(logging.ERROR), _error=logger.error):
+        start_time = _perf()
+        
         try:
-            # Get a task from the queue
-            task = await request_queue.get()
-            if task is None:  # Sentinel value to stop the worker
-                request_queue.task_done()
-                break
-                
-            # Make the request
-            status = await make_request(session, endpoint, api_url)
-            results["total"] += 1
-            if status == 200:
-                results["success"] += 1
-            else:
-                results["failed"] += 1
-                
-            request_queue.task_done()
+            # Awaiting the request directly skips the async context manager; only
+            # the status is needed, so the body is never read before release()
+            response = await _get()
+            try:
+                status = response.status
+            finally:
+                response.release()
+            elapsed = _perf() - start_time
+            _latencies[_next_slot() % _size] = elapsed
+            # Successes are only reported in the aggregated test results; error
+            # messages are not even built when errors are filtered out
+            if status != 200 and _log_errors:
+                _error(f"Failed: {_url} - {status} - {elapsed:.2f}s")
+            return status
         except Exception as e:
-            logger.error(f"Worker error: {str(e)}")
-            request_queue.task_done()
-
-async def run_load_test(config):
-    """Execute the load test with the given configuration."""
-    results = {"total": 0, "success": 0, "failed": 0}
-    request_queue = asyncio.Queue()
-    timeout = ClientTimeout(total=config["request_timeout"])
+            if _log_errors:
+                elapsed = _perf() - start_time
+                _error(f"Error: {_url} - {str(e)} - {elapsed:.2f}s")
+            return None
     
-    logger.info(f"Starting stress test with {config['concurrent_requests']} concurrent connections")
-    logger.info(f"Test will run for {config['test_duration']} seconds")
-    logger.info(f"Target API: {config['api_url']}")
-    logger.info(f"Target endpoint: {config['endpoint']}")
+    return _do
+
+async def worker(do, deadline, batch_size, counters, offset):
+    """Worker that keeps batches of requests in flight until the deadline.
     
-    connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300)
-    async with ClientSession(timeout=timeout, connector=connector) as session:
-        # Create worker tasks
-        workers = []
-        for _ in range(config['concurrent_requests']):
-            task = asyncio.create_task(
-                worker(session, request_queue, results, config['api_url'], config['endpoint'])
-            )
-            workers.append(task)
-        
-        # Start time for the test
-        start_time = time.time()
-        
-        # Generate load until the test duration is reached
-        try:
-            while time.time() - start_time < config['test_duration']:
-                # Add task to queue - simplified to just push a placeholder since we always hit the same endpoint
-                await request_queue.put(True)
-                # Small delay to avoid overloading the queue
-                await asyncio.sleep(0.01)
-        
-        except Exception as e:
-            logger.error(f"Test error during request generation: {str(e)}")
-        
-        # Send sentinel values to stop workers
-        for _ in range(config['concurrent_requests']):
-            await request_queue.put(None)
-        
-        # Wait for all workers to finish
-        await asyncio.gather(*workers)
+    Progress is added to the partition's live counters after every batch;
+    returns its (total, success, failed) counts once it finishes.
+    """
+    total = success = 0
+    while monotonic() < deadline:
+        # Issue the whole batch at once; exceptions are counted as failures
+        statuses = await asyncio.gather(
+            *(do() for _ in range(batch_size)),
+            return_exceptions=True
+        )
+        ok = statuses.count(200)
+        total += batch_size
+        success += ok
+        # Only this process writes these slots and the loop is single
+        # threaded, so no lock is needed
+        counters[offset] += batch_size
+        counters[offset + 1] += ok
+    return total, success, total - success
+
+async def get_session(config):
+    """Return the pooled session, rebuilding it only when its settings change."""
+    global session, session_key
+    key = (config.concurrent_requests, config.request_timeout)
+    if session is None or session.closed or session_key != key:
+        if session is not None:
+            await session.close()
+        # Pooled keep-alive connections bounded to the test concurrency. There is
+        # no connector flag for TCP_NODELAY: asyncio sets it on every TCP socket
+        # it opens, so small GETs are never held back by Nagle's algorithm
+        connector = aiohttp.TCPConnector(
+            limit=config.concurrent_requests,
+            limit_per_host=config.concurrent_requests,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            force_close=False,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        session = ClientSession(timeout=ClientTimeout(total=config.request_timeout), connector=connector)
+        session_key = key
+    return session
+
+async def run_load_test(config, index=0):
+    """Execute one partition of the load test and return its raw counts."""
+    session = await get_session(config)
+    
+    # Start time and deadline for the test
+    start_time = monotonic()
+    deadline = start_time + config.test_duration
+    
+    # The target URL is constant for the whole test, so build it once
+    url = config.api_url + config.endpoint
+    get = functools.partial(session.get, url, allow_redirects=False)
+    
+    # Preallocated float32 latency ring buffer; the event loop is single
+    # threaded, so the shared slot counter needs no locking
+    latencies = np.empty(LATENCY_BUFFER_SIZE, dtype=np.float32)
+    slot = itertools.count()
+    do = make_request_fn(get, url, latencies, slot)
+    
+    # Create worker tasks; each one keeps a batch of requests in flight until the
+    # deadline. The last batch takes the remainder, so the batches add up to
+    # exactly concurrent_requests, the size of the connection pool
+    concurrency = config.concurrent_requests
+    batch_size = min(REQUEST_BATCH_SIZE, concurrency)
+    num_workers = -(-concurrency // batch_size)
+    batch_sizes = [batch_size] * (num_workers - 1) + [concurrency - (num_workers - 1) * batch_size]
+    if hasattr(asyncio, "TaskGroup"):
+        # Structured concurrency (Python 3.11+): the group waits for every
+        # worker and cancels the rest if one fails
+        async with asyncio.TaskGroup() as tg:
+            workers = [
+                tg.create_task(worker(do, deadline, size, live_counters, 2 * index))
+                for size in batch_sizes
+            ]
+        counts = [task.result() for task in workers]
+    else:
+        counts = await asyncio.gather(*(
+            worker(do, deadline, size, live_counters, 2 * index) for size in batch_sizes
+        ))
+    
+    # Reduce the worker counts; only the filled part of the buffer is sent back
+    total_time = monotonic() - start_time
+    return {
+        "total": sum(c[0] for c in counts),
+        "success": sum(c[1] for c in counts),
+        "failed": sum(c[2] for c in counts),
+        "total_time": total_time,
+        "latencies": latencies[:min(next(slot), LATENCY_BUFFER_SIZE)]
+    }
+
+def init_partition_process(counters):
+    """Keep the shared live counters in a freshly spawned pool process."""
+    global live_counters
+    live_counters = counters
+
+def run_partition(config, index):
+    """Run one partition of a test inside a pool process."""
+    global partition_loop
+    
+    # Each pool process keeps its own loop (and with it its pooled session)
+    if partition_loop is None:
+        partition_loop = new_event_loop()
+        asyncio.set_event_loop(partition_loop)
+    return partition_loop.run_until_complete(run_load_test(config, index))
+
+def split_config(config, parts):
+    """Split the concurrency of a test config as evenly as possible."""
+    concurrency = config.concurrent_requests
+    parts = max(1, min(parts, concurrency))
+    return [
+        replace(config, concurrent_requests=concurrency // parts + (1 if i < concurrency % parts else 0))
+        for i in range(parts)
+    ]
+
+def summarize_results(partials):
+    """Aggregate partition results and log the test summary."""
+    results = {
+        "total": sum(p["total"] for p in partials),
+        "success": sum(p["success"] for p in partials),
+        "failed": sum(p["failed"] for p in partials)
+    }
     
     # Calculate and log results
-    total_time = time.time() - start_time
+    total_time = max(p["total_time"] for p in partials)
     requests_per_second = results["total"] / total_time if total_time > 0 else 0
     success_rate = (results["success"] / results["total"]) * 100 if results["total"] > 0 else 0
     
@@ -124,64 +268,130 @@ async def run_load_test(config):
     results["requests_per_second"] = round(requests_per_second, 2)
     results["success_rate"] = round(success_rate, 2)
     
+    # Latency percentiles in one vectorized pass over every partition's samples
+    latencies = np.concatenate([p["latencies"] for p in partials])
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        results["latency_ms"] = {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+    
     logger.info(f"Test completed in {total_time:.2f} seconds")
     logger.info(f"Total requests: {results['total']}")
     logger.info(f"Successful requests: {results['success']}")
     logger.info(f"Failed requests: {results['failed']}")
     logger.info(f"Requests per second: {requests_per_second:.2f}")
     logger.info(f"Success rate: {success_rate:.2f}%")
+    if "latency_ms" in results:
+        logger.info(f"Latency p50/p95/p99: {results['latency_ms']['p50']:.2f}/"
+                    f"{results['latency_ms']['p95']:.2f}/{results['latency_ms']['p99']:.2f} ms")
     
     return results
 
-# Thread management
-def execute_test_in_thread():
-    """Execute the test in a background thread."""
-    global is_test_running, last_test_results, current_config
+# Process and thread management
+def get_process_pool():
+    """Return the long-lived pool of load-generator processes."""
+    global process_pool, live_counters
+    if process_pool is None:
+        # spawn starts clean interpreters instead of forking the running server loop
+        context = multiprocessing.get_context("spawn")
+        live_counters = context.RawArray('Q', 2 * PROCESS_COUNT)
+        process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_COUNT,
+            mp_context=context,
+            initializer=init_partition_process,
+            initargs=(live_counters,)
+        )
+    return process_pool
+
+def discard_process_pool(pool):
+    """Drop a broken pool so the next test starts a fresh one."""
+    global process_pool, live_counters
+    logger.error("A load-generator process died, recreating the process pool")
+    pool.shutdown(wait=False, cancel_futures=True)
+    if process_pool is pool:
+        process_pool = None
+        live_counters = None
+
+def live_progress():
+    """Sum the live counters of the running test as (total, success)."""
+    if live_counters is None:
+        return 0, 0
+    counters = live_counters[:]
+    return sum(counters[0::2]), sum(counters[1::2])
+
+async def run_distributed_test(config):
+    """Run the test on every pool process and aggregate the results."""
+    partitions = split_config(config, PROCESS_COUNT)
     
-    with test_lock:
-        if is_test_running:
-            logger.warning("Test already running, ignoring request")
-            return False
-        is_test_running = True
+    logger.info(f"Starting stress test with {config.concurrent_requests} concurrent connections "
+                f"across {len(partitions)} processes")
+    logger.info(f"Test will run for {config.test_duration} seconds")
+    logger.info(f"Target API: {config.api_url}")
+    logger.info(f"Target endpoint: {config.endpoint}")
     
-    def run():
-        global is_test_running, last_test_results
-        
-        # Create new event loop for the thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            # Use a thread-local copy of the configuration
-            with test_lock:
-                config = current_config.copy()
-            
-            # Run the test
-            results = loop.run_until_complete(run_load_test(config))
-            
-            # Store results
-            with test_lock:
-                last_test_results = results
-        except Exception as e:
-            logger.error(f"Error in test thread: {str(e)}")
-        finally:
-            with test_lock:
-                is_test_running = False
-            loop.close()
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    # Wait for every partition even if one fails, so no partition of this test
+    # is still running (and writing to live_counters) when the next one starts
+    partials = await asyncio.gather(
+        *(loop.run_in_executor(pool, run_partition, partition, index)
+          for index, partition in enumerate(partitions)),
+        return_exceptions=True
+    )
+    errors = [p for p in partials if isinstance(p, BaseException)]
+    if errors:
+        if any(isinstance(e, BrokenProcessPool) for e in errors):
+            discard_process_pool(pool)
+        raise errors[0]
+    return summarize_results(partials)
+
+def is_test_running():
+    """Whether a load test task is currently in progress."""
+    return current_test is not None and not current_test.done()
+
+async def run_test_task(config):
+    """Run a test and keep its results for /status."""
+    global last_test_results
+    
+    try:
+        last_test_results = await run_distributed_test(config)
+    except Exception as e:
+        logger.error(f"Error in test task: {str(e)}")
+
+def start_test_task():
+    """Start the test as a background task on the server's event loop."""
+    global current_test
+    
+    if is_test_running():
+        logger.warning("Test already running, ignoring request")
+        return False
     
-    # Start the test in a new thread
-    thread = threading.Thread(target=run)
-    thread.daemon = True
-    thread.start()
+    # Start the live counters from zero before /status can see the new test
+    if live_counters is not None:
+        live_counters[:] = [0] * len(live_counters)
+    
+    # The config snapshot is never mutated, so the task can use it as is
+    current_test = asyncio.create_task(run_test_task(current_config))
     return True
 
-# Flask application
-app = Flask(__name__)
+# FastAPI application
+app = FastAPI()
+
+# Last serialized /status body and the state it was built from
+status_cache = {"state": None, "body": None}
 
-@app.route('/', methods=['GET'])
-def home():
+def _json(obj, status_code=200):
+    """Serialize obj with orjson into a JSON response."""
+    return Response(orjson.dumps(obj), status_code=status_code, media_type='application/json')
+
+async def _parse_json(request):
+    """Parse the request body with orjson, returning None when it is empty."""
+    body = await request.body()
+    return orjson.loads(body) if body else None
+
+@app.get('/')
+async def home():
     """Home endpoint with service information."""
-    return jsonify({
+    return _json({
         "service": "API Load Test Service",
         "status": "running",
         "endpoints": {
@@ -192,124 +402,148 @@ def home():
         }
     })
 
-@app.route('/config', methods=['GET', 'POST'])
-def config():
+@app.api_route('/config', methods=['GET', 'POST'])
+async def config(request: Request):
     """Get or update the test configuration."""
     global current_config
     
     if request.method == 'POST':
         try:
-            new_config = request.get_json()
+            new_config = await _parse_json(request)
             if not new_config:
-                return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+                return _json({"status": "error", "message": "Invalid JSON data"}, 400)
             
-            with test_lock:
-                if is_test_running:
-                    return jsonify({"status": "error", "message": "Cannot update config while test is running"}), 400
-                
-                # Update only valid configuration parameters
-                for key, value in new_config.items():
-                    if key in current_config:
-                        current_config[key] = value
+            if is_test_running():
+                return _json({"status": "error", "message": "Cannot update config while test is running"}, 400)
+            
+            # Update only valid configuration parameters on a new snapshot
+            current_config = replace(current_config, **{
+                key: value for key, value in new_config.items() if key in CONFIG_FIELDS
+            })
             
-            return jsonify({"status": "success", "config": current_config})
+            return _json({"status": "success", "config": current_config})
+        except ValueError as e:
+            # Invalid JSON or configuration values
+            return _json({"status": "error", "message": str(e)}, 400)
         except Exception as e:
             logger.error(f"Error updating config: {str(e)}")
-            return jsonify({"status": "error", "message": str(e)}), 500
+            return _json({"status": "error", "message": str(e)}, 500)
     
     # GET request - return current configuration
-    return jsonify(current_config)
+    return _json(current_config)
 
-@app.route('/start-test', methods=['POST'])
-def start_test():
+@app.post('/start-test')
+async def start_test():
     """Start a load test with the current configuration."""
-    with test_lock:
-        if is_test_running:
-            return jsonify({"status": "error", "message": "A test is already running"}), 400
+    if is_test_running():
+        return _json({"status": "error", "message": "A test is already running"}, 400)
     
     try:
         # Start the test
-        success = execute_test_in_thread()
+        success = start_test_task()
         
         if success:
-            return jsonify({
+            return _json({
                 "status": "success", 
                 "message": "Test started", 
                 "config": current_config
             })
         else:
-            return jsonify({
+            return _json({
                 "status": "error", 
                 "message": "Failed to start test, another test may be running"
-            }), 400
+            }, 400)
     except Exception as e:
         logger.error(f"Error starting test: {str(e)}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return _json({"status": "error", "message": str(e)}, 500)
 
-@app.route('/status', methods=['GET'])
-def test_status():
+@app.get('/status')
+async def test_status():
     """Get the current test status and results."""
-    with test_lock:
-        if is_test_running:
-            return jsonify({
+    running = is_test_running()
+    results = last_test_results
+    config = current_config
+    progress = live_progress() if running else None
+    
+    # Results and config are swapped, never mutated, so identity tells whether
+    # the cached body is still current
+    state = status_cache["state"]
+    if (state is None or state[0] != running or state[1] is not results
+            or state[2] is not config or state[3] != progress):
+        if running:
+            body = {
                 "status": "running",
-                "config": current_config
-            })
-        elif last_test_results:
-            return jsonify({
+                "progress": {
+                    "total": progress[0],
+                    "success": progress[1],
+                    "failed": progress[0] - progress[1]
+                },
+                "config": config
+            }
+        elif results:
+            body = {
                 "status": "completed",
-                "results": last_test_results,
-                "config": current_config
-            })
+                "results": results,
+                "config": config
+            }
         else:
-            return jsonify({
+            body = {
                 "status": "idle",
-                "config": current_config
-            })
+                "config": config
+            }
+        status_cache["body"] = orjson.dumps(body)
+        status_cache["state"] = (running, results, config, progress)
+    
+    return Response(status_cache["body"], media_type='application/json')
 
-@app.route('/run-test', methods=['POST'])
-def run_test():
+@app.post('/run-test')
+async def run_test(request: Request):
     """Run a test with specified parameters."""
     global current_config
     
-    with test_lock:
-        if is_test_running:
-            return jsonify({"status": "error", "message": "A test is already running"}), 400
+    if is_test_running():
+        return _json({"status": "error", "message": "A test is already running"}, 400)
     
     try:
         # Get test parameters
-        data = request.get_json() or {}
+        data = await _parse_json(request) or {}
         
-        # Configure the test
-        with test_lock:
-            current_config["api_url"] = data.get("api_url", "http://target-api:5000")
-            current_config["endpoint"] = data.get("endpoint", "/")  # Simplified to one endpoint
-            current_config["test_duration"] = data.get("seconds", 30)
-            current_config["concurrent_requests"] = data.get("requests", 50)
-            current_config["request_timeout"] = data.get("timeout", 5)
+        # Configure the test by swapping in a new snapshot
+        current_config = TestConfig(
+            api_url=data.get("api_url", DEFAULT_CONFIG.api_url),
+            endpoint=data.get("endpoint", DEFAULT_CONFIG.endpoint),  # Simplified to one endpoint
+            test_duration=data.get("seconds", DEFAULT_CONFIG.test_duration),
+            concurrent_requests=data.get("requests", DEFAULT_CONFIG.concurrent_requests),
+            request_timeout=data.get("timeout", DEFAULT_CONFIG.request_timeout)
+        )
         
         # Start the test
-        success = execute_test_in_thread()
+        success = start_test_task()
         
         if success:
-            return jsonify({
+            return _json({
                 "status": "success", 
                 "message": "Test started", 
                 "config": current_config
             })
         else:
-            return jsonify({
+            return _json({
                 "status": "error", 
                 "message": "Failed to start test"
-            }), 500
+            }, 500)
+    except ValueError as e:
+        # Invalid JSON or test parameters
+        return _json({"status": "error", "message": str(e)}, 400)
     except Exception as e:
         logger.error(f"Error starting test: {str(e)}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return _json({"status": "error", "message": str(e)}, 500)
 
-@app.route('/health', methods=['GET'])
-def health_check():
+@app.get('/health')
+async def health_check():
     """Simple health check endpoint for Docker."""
-    return Response("OK", status=200)
+    return PlainTextResponse("OK", status_code=200)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8080, debug=False)
\ No newline at end of file
+    # A single worker: the running test, results and process pool live in
+    # this process and would diverge between several workers
+    uvicorn.run(app, host="0.0.0.0", port=8080, workers=1)